@@ -1,7 +1,80 @@
-import collections
+import heapq
+from collections.abc import Sequence
+from array import array
 from typing import Dict, List, Tuple, Optional, Literal
 
+# numpy e numba são opcionais: sem numba os laços rodam em Python, sem numpy também a
+# leitura dos traces e o cálculo dos números de página
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = np is not None
+except ImportError:
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    prange = range
+
+try:
+    from mem_sim_core import simulate as _simulate_c
+except ImportError:  # extensão Cython não compilada (cythonize -i mem_sim_core.pyx)
+    _simulate_c = None
+
+_POLICIES = frozenset({'LRU', 'SecondChance'})
+
+# Numeric ids of the replacement policies: the hot paths compare ints, and strings can't
+# go into numba kernels or sweep configs
+_LRU = 0
+_SECOND_CHANCE = 1
+_POLICY_IDS = {'LRU': _LRU, 'SecondChance': _SECOND_CHANCE}
+
+if np is not None:
+    # Row layout of the configs passed to simulate_sweep
+    SWEEP_CONFIG_DTYPE = np.dtype([
+        ('page_size', np.int64),
+        ('num_tlb_entries', np.int64),
+        ('num_frames', np.int64),
+        ('policy_id', np.int64),
+    ])
+
+
+def _as_address_array(addresses):
+    """
+    Converts addresses to an int64 numpy array. Arrays and sequences go through
+    np.asarray; any other iterable (e.g. a generator) is consumed with np.fromiter.
+    """
+    if isinstance(addresses, (np.ndarray, Sequence)):
+        return np.asarray(addresses, dtype=np.int64)
+    return np.fromiter(addresses, dtype=np.int64)
+
+
+def _check_parameters(page_size: int, num_tlb_entries: int, num_frames: int) -> None:
+    """Raises ValueError for parameters the simulator (or its kernels) can't run with."""
+    if page_size <= 0 or page_size & (page_size - 1) != 0:
+        raise ValueError("Tamanho de página inválido. Use uma potência de 2.")
+    if num_tlb_entries < 0:
+        raise ValueError("Número de entradas na TLB inválido. Use um valor maior ou igual a 0.")
+    if num_frames < 1:
+        raise ValueError("Número de frames inválido. Use pelo menos 1 frame.")
+
+
 class MemorySimulator:
+    __slots__ = (
+        'debug', 'page_size', 'num_tlb_entries', 'num_frames', 'replacement_policy', '_policy_id',
+        '_page_shift', '_page_mask',
+        'tlb', 'page_table', 'frames', '_free_frames',
+        '_stats',
+        '_clock', '_lru_ts', '_lru_heap',
+        '_ref_bits', '_hand',
+        '_find_victim',
+    )
+
     def __init__(self, page_size: int, num_tlb_entries: int, num_frames: int, replacement_policy: Literal['LRU', 'SecondChance'], debug: bool = False):
         self.debug = debug
         
@@ -10,20 +83,53 @@ class MemorySimulator:
         self.num_frames = num_frames    
         self.replacement_policy = replacement_policy
 
-        if replacement_policy not in ['LRU', 'SecondChance']:
+        if replacement_policy not in _POLICIES:
             raise ValueError("Política de substituição inválida. Use 'LRU' ou 'SecondChance'.")
+        self._policy_id = _POLICY_IDS[replacement_policy]
+
+        _check_parameters(page_size, num_tlb_entries, num_frames)
+
+        # page_size is a power of two: page_number = address >> shift, offset = address & mask
+        self._page_shift = page_size.bit_length() - 1
+        self._page_mask = page_size - 1
+
+        # Victim selection is bound once here, so page faults don't compare policy strings
+        self._find_victim = self._find_victim_lru if self._policy_id == _LRU else self._find_victim_second_chance
 
-        self.tlb: collections.OrderedDict = collections.OrderedDict()           # Dict[int, int] -> page_number: frame_number
-        self.page_table: collections.OrderedDict = collections.OrderedDict()    # Dict[int, int] -> page_number: frame_number
-        self.frames: List[Optional[int]] = [None] * num_frames                  # frames[frame_number] = page_number
+        # Plain dicts keep insertion order: the first TLB key is the LRU entry, and an entry is
+        # refreshed by popping and re-inserting it at the end (cheaper than OrderedDict.move_to_end)
+        self.tlb: Dict[int, int] = {}               # page_number: frame_number
+        self.page_table: Dict[int, int] = {}        # page_number: frame_number
+        self.frames: array = array('q', [-1]) * num_frames                      # frames[frame_number] = page_number, -1 if free
+        self._free_frames: List[int] = list(range(num_frames - 1, -1, -1))     # stack of free frames, lowest on top
 
         # Stats counters
-        self.tlb_hits = 0
-        self.tlb_misses = 0
-        self.page_faults = 0
+        self._stats: array = array('q', [0, 0, 0])  # tlb_hits, tlb_misses, page_faults
         
-        self.second_chance_bits: Dict[int, bool] = {} # page_number: reference_bit
+        # LRU: last-access timestamp of each loaded page plus a min-heap of (timestamp, page_number).
+        # Heap entries are invalidated lazily: an entry whose timestamp no longer matches
+        # _lru_ts is stale and skipped when looking for a victim.
+        self._clock = 0
+        self._lru_ts: Dict[int, int] = {}
+        self._lru_heap: List[Tuple[int, int]] = []
 
+        # SecondChance: reference bits packed 64 frames per word (bit f & 63 of word f >> 6)
+        # and the clock hand, i.e. the next frame to be inspected.
+        self._ref_bits: List[int] = [0] * ((num_frames + 63) // 64)
+        self._hand = 0
+
+
+    @property
+    def tlb_hits(self) -> int:
+        return self._stats[0]
+
+    @property
+    def tlb_misses(self) -> int:
+        return self._stats[1]
+
+    @property
+    def page_faults(self) -> int:
+        return self._stats[2]
 
     def access_memory(self, virtual_address: int) -> int:
         """
@@ -36,27 +142,39 @@ class MemorySimulator:
         if self.debug:
             print(f"Acessando endereço virtual: {virtual_address}")
         
-        page_number = virtual_address // self.page_size
-        # offset = virtual_address % self.page_size (not used in this simulation)
+        page_number = virtual_address >> self._page_shift
+        # offset = virtual_address & self._page_mask (not used in this simulation)
 
-        # Verify TLB:
-        if page_number in self.tlb:
+        # Same page as the previous access: it is already the MRU entry of the TLB and of the
+        # replacement policy, so the hit needs no update at all
+        tlb = self.tlb
+        if tlb and next(reversed(tlb)) == page_number:
+            if self.debug:
+                print(f"TLB Hit para a página {page_number}")
+            self._stats[0] += 1
+            return tlb[page_number]
+
+        # Verify TLB (a single hash lookup on a hit; only misses pay for the exception):
+        try:
+            frame_number = tlb.pop(page_number)
+        except KeyError:
+            pass
+        else:
             if self.debug:
                 print(f"TLB Hit para a página {page_number}")
             
-            self.tlb_hits += 1
-            frame_number = self.tlb[page_number]
-            self.tlb.move_to_end(page_number) 
-
-            if self.replacement_policy == 'LRU':
-                self.page_table.move_to_end(page_number)
-            elif self.replacement_policy == 'SecondChance':
-                self.second_chance_bits[page_number] = True
+            self._stats[0] += 1
+            tlb[page_number] = frame_number # re-insert as the most recently used entry
+
+            if self._policy_id == _LRU:
+                self._touch_lru(page_number)
+            else:
+                self._ref_bits[frame_number >> 6] |= 1 << (frame_number & 63)
             return frame_number
         
         if self.debug:
             print(f"TLB Miss para a página {page_number}")
-        self.tlb_misses += 1
+        self._stats[1] += 1
 
         # Verify Page Table:
         if page_number in self.page_table:
@@ -64,38 +182,183 @@ class MemorySimulator:
                 print(f"Page Table Hit para a página {page_number}")
             
             frame_number = self.page_table[page_number]
+            if self._policy_id == _LRU:
+                self._touch_lru(page_number)
+            else:
+                self._ref_bits[frame_number >> 6] |= 1 << (frame_number & 63)
             
-            if self.replacement_policy == 'LRU':
-                self.page_table.move_to_end(page_number)
-            elif self.replacement_policy == 'SecondChance':
-                self.second_chance_bits[page_number] = True
-            
-            self._update_tlb(page_number, frame_number)
+            # Inlined _update_tlb: the miss above already proved page_number is not in the TLB
+            if self.num_tlb_entries:
+                if len(tlb) >= self.num_tlb_entries:
+                    del tlb[next(iter(tlb))]
+                tlb[page_number] = frame_number
             return frame_number
 
         if self.debug:
             print(f"Page Fault para a página {page_number}")
-        self.page_faults += 1
+        self._stats[2] += 1
         frame_number = self._handle_page_fault(page_number)
+        if self._policy_id == _LRU:
+            self._touch_lru(page_number)
+        else:
+            self._ref_bits[frame_number >> 6] |= 1 << (frame_number & 63)
         self._update_tlb(page_number, frame_number)
         return frame_number
 
+    def run_trace(self, addresses) -> None:
+        """
+        Simulates a whole sequence of virtual addresses.
+
+        With numpy available the page numbers are computed for the whole trace at once.
+        They then go to the compiled kernels (when numba is available) or to the
+        interpreted loop _run_pages_python. Debug mode goes through access_memory.
+        """
+        if self.debug:
+            for virtual_address in addresses:
+                self.access_memory(int(virtual_address))
+            return
+
+        if np is None:
+            page_shift = self._page_shift
+            self._run_pages_python(int(virtual_address) >> page_shift for virtual_address in addresses)
+            return
+
+        pages = _as_address_array(addresses) >> self._page_shift
+        if _HAS_NUMBA:
+            self._run_pages_compiled(np.ascontiguousarray(pages))
+        else:
+            self._run_pages_python(pages.tolist())
+
+    def run_file(self, path: str) -> None:
+        """
+        Simulates every address of a trace file (one decimal address per line).
+        """
+        if np is not None:
+            self.run_trace(np.fromfile(path, dtype=np.int64, sep='\n'))
+            return
+        with open(path, "r") as trace:
+            self.run_trace(int(line) for line in trace)
+
+    def _run_pages_compiled(self, pages) -> None:
+        """
+        Runs an int64 array of page numbers through `_simulate_lru` or
+        `_simulate_second_chance`. The simulator state is exported to arrays before the
+        call and rebuilt afterwards, so it is the same as if every address had gone
+        through access_memory.
+        """
+        # Export state: -1 marks an empty slot, timestamps follow the LRU order
+        tlb_pages = np.full(self.num_tlb_entries, -1, dtype=np.int64)
+        tlb_frames = np.zeros(self.num_tlb_entries, dtype=np.int64)
+        tlb_ts = np.zeros(self.num_tlb_entries, dtype=np.int64)
+        for i, (page_number, frame_number) in enumerate(self.tlb.items()):
+            tlb_pages[i] = page_number
+            tlb_frames[i] = frame_number
+            tlb_ts[i] = i + 1
+
+        pt_pages = np.frombuffer(self.frames, dtype=np.int64)  # shares memory with self.frames
+        stats = np.frombuffer(self._stats, dtype=np.int64)  # the kernels add the counts in place
+
+        if self._policy_id == _LRU:
+            pt_ts = np.zeros(self.num_frames, dtype=np.int64)
+            for page_number, ts in self._lru_ts.items():
+                pt_ts[self.page_table[page_number]] = ts
+
+            _simulate_lru(pages, self.num_tlb_entries, self.num_frames,
+                          tlb_pages, tlb_frames, tlb_ts, pt_pages, pt_ts, stats)
+
+            self._lru_ts = {int(pt_pages[f]): int(pt_ts[f]) for f in range(self.num_frames) if pt_pages[f] != -1}
+            self._lru_heap = []
+            self._compact_lru_heap()
+            self._clock = max(self._clock, int(pt_ts.max(initial=0)))
+        else:
+            ref_bits = np.array(self._ref_bits, dtype=np.uint64)
+
+            self._hand = _simulate_second_chance(
+                pages, self.num_tlb_entries, self.num_frames,
+                tlb_pages, tlb_frames, tlb_ts, pt_pages, ref_bits, self._hand, stats
+            )
+
+            self._ref_bits = [int(word) for word in ref_bits]
+
+        # Import the shared state back, TLB ordered from least to most recently used
+        self.tlb = dict(
+            (int(tlb_pages[i]), int(tlb_frames[i])) for i in np.argsort(tlb_ts) if tlb_pages[i] != -1
+        )
+        self._free_frames = [f for f in range(self.num_frames - 1, -1, -1) if self.frames[f] == -1]
+        self.page_table = {int(pt_pages[f]): f for f in range(self.num_frames) if pt_pages[f] != -1}
+
+    def _run_pages_python(self, pages) -> None:
+        """
+        Interpreted run over page numbers: the same steps as access_memory, but with the
+        attributes bound to locals once and the counters written back at the end.
+        """
+        tlb = self.tlb
+        page_table = self.page_table
+        num_tlb_entries = self.num_tlb_entries
+        ref_bits = self._ref_bits
+        lru_ts = self._lru_ts
+        lru_heap = self._lru_heap
+        heap_limit = self._lru_heap_limit()
+        heappush = heapq.heappush
+        compact_lru_heap = self._compact_lru_heap
+        handle_page_fault = self._handle_page_fault
+        lru = self._policy_id == _LRU
+        clock = self._clock
+        hits = misses = faults = 0
+        # Previous page, which is the MRU of the TLB (see access_memory); -1 while unknown
+        last_page = next(reversed(tlb)) if tlb else -1
+
+        for page_number in pages:
+            if page_number == last_page:
+                hits += 1
+                continue
+            try:
+                tlb[page_number] = frame_number = tlb.pop(page_number)
+                hits += 1
+                last_page = page_number
+            except KeyError:
+                misses += 1
+                if page_number in page_table:
+                    frame_number = page_table[page_number]
+                else:
+                    faults += 1
+                    frame_number = handle_page_fault(page_number)
+                if num_tlb_entries:
+                    if len(tlb) >= num_tlb_entries:
+                        del tlb[next(iter(tlb))]
+                    tlb[page_number] = frame_number
+                    last_page = page_number
+
+            if lru:
+                clock += 1
+                lru_ts[page_number] = clock
+                heappush(lru_heap, (clock, page_number))
+                if len(lru_heap) > heap_limit:
+                    compact_lru_heap()
+            else:
+                ref_bits[frame_number >> 6] |= 1 << (frame_number & 63)
+
+        self._clock = clock
+        stats = self._stats
+        stats[0] += hits
+        stats[1] += misses
+        stats[2] += faults
+
     def _update_tlb(self, page_number: int, frame_number: int) -> None:
         """
         Inserts/updates an entry in the TLB using LRU policy.
         """
+        if self.num_tlb_entries == 0:
+            return
         if len(self.tlb) >= self.num_tlb_entries:
-            self.tlb.popitem(last=False) # Remove the least recently used entry
+            del self.tlb[next(iter(self.tlb))] # Remove the least recently used entry
         self.tlb[page_number] = frame_number
     
     def _allocate_frame(self) -> Optional[int]:
         """
         Finds a free frame. Returns the frame number or None if all frames are occupied.
         """
-        for i in range(self.num_frames):
-            if self.frames[i] is None:
-                return i
-        return None
+        return self._free_frames.pop() if self._free_frames else None
     
     def _handle_page_fault(self, page_number: int) -> int:
         """
@@ -107,23 +370,39 @@ class MemorySimulator:
         frame_number = self._allocate_frame()
         
         if frame_number is None:
-            if self.replacement_policy == 'LRU':
-                frame_number = self._find_victim_lru()
-            elif self.replacement_policy == 'SecondChance':
-                frame_number = self._find_victim_second_chance()
+            frame_number = self._find_victim()
         
         self.frames[frame_number] = page_number
         self.page_table[page_number] = frame_number
-        
-        if self.replacement_policy == 'SecondChance':
-            self.second_chance_bits[page_number] = True
-        
         return frame_number
     
+    def _touch_lru(self, page_number: int) -> None:
+        """Marks page_number as the most recently used page (LRU policy)."""
+        self._clock += 1
+        self._lru_ts[page_number] = self._clock
+        heapq.heappush(self._lru_heap, (self._clock, page_number))
+        if len(self._lru_heap) > self._lru_heap_limit():
+            self._compact_lru_heap()
+
+    def _lru_heap_limit(self) -> int:
+        """Heap size above which stale entries are dropped."""
+        return 4 * self.num_frames + 64
+
+    def _compact_lru_heap(self) -> None:
+        """Rebuilds the LRU heap (in place) from the live timestamps, dropping stale entries."""
+        self._lru_heap[:] = [(ts, page_number) for page_number, ts in self._lru_ts.items()]
+        heapq.heapify(self._lru_heap)
+
     def _find_victim_lru(self) -> int:
         """selects a victim page using LRU policy and returns its frame number."""
 
-        victim_page, frame_to_evict = self.page_table.popitem(last=False) # First entry is the LRU
+        lru_ts = self._lru_ts
+        while True:
+            ts, victim_page = heapq.heappop(self._lru_heap)
+            if lru_ts.get(victim_page) == ts: # otherwise the entry is stale
+                break
+        del lru_ts[victim_page]
+        frame_to_evict = self.page_table.pop(victim_page)
 
         if victim_page in self.tlb:
             del self.tlb[victim_page]
@@ -134,25 +413,47 @@ class MemorySimulator:
         return frame_to_evict
 
     def _find_victim_second_chance(self) -> int:
-        """selects a victim page using Second Chance policy and returns its frame number."""
+        """
+        selects a victim page using Second Chance (clock) policy and returns its frame number.
+
+        Starting at the hand, the reference bits are inspected a whole word (64 frames) at a
+        time: the lowest clear bit is the victim, and every set bit before it is cleared
+        (second chance). A word with all bits set is cleared at once and skipped.
+        """
+        ref_bits = self._ref_bits
+        num_frames = self.num_frames
+        hand = self._hand
         while True:
-            victim_page, frame_to_evict = self.page_table.popitem(last=False) # First entry is the oldest
+            word_index, bit = hand >> 6, hand & 63
+            valid_bits = min(64, num_frames - (word_index << 6)) - bit
+            clear_bits = ~(ref_bits[word_index] >> bit) & ((1 << valid_bits) - 1)
+            if clear_bits:
+                offset = (clear_bits & -clear_bits).bit_length() - 1
+                ref_bits[word_index] &= ~(((1 << offset) - 1) << bit)
+                frame_to_evict = hand + offset
+                break
+            ref_bits[word_index] &= (1 << bit) - 1
+            hand = (word_index + 1) << 6
+            if hand >= num_frames:
+                hand = 0
+        self._hand = (frame_to_evict + 1) % num_frames
 
-            if self.second_chance_bits.get(victim_page, False) == True:
-                # Give a second chance
-                self.second_chance_bits[victim_page] = False
-                self.page_table[victim_page] = frame_to_evict
-                continue
-            else:
-                # Evict this page
-                if victim_page in self.tlb:
-                    del self.tlb[victim_page]
-                del self.second_chance_bits[victim_page]
+        victim_page = self.frames[frame_to_evict]
+        del self.page_table[victim_page]
+        if victim_page in self.tlb:
+            del self.tlb[victim_page]
 
-                if self.debug:
-                    print(f"Second Chance: Removendo página {victim_page} do frame {frame_to_evict}")
-                
-                return frame_to_evict
+        if self.debug:
+            print(f"Second Chance: Removendo página {victim_page} do frame {frame_to_evict}")
+
+        return frame_to_evict
+
+    def stats(self) -> Tuple[int, int, int]:
+        """
+        Returns (tlb_hits, tlb_misses, page_faults) without any formatting, for benchmarks.
+        """
+        stats = self._stats
+        return stats[0], stats[1], stats[2]
 
     def print_statistics(self):
         print("=" * 60)
@@ -167,3 +468,413 @@ class MemorySimulator:
         print(f"TLB Misses:                 {self.tlb_misses:,}")
         print(f"Page Faults:                {self.page_faults:,}")
         print("=" * 60)
+
+
+def simulate(addresses, page_size: int, num_tlb_entries: int, num_frames: int,
+             replacement_policy: Literal['LRU', 'SecondChance']) -> Tuple[int, int, int]:
+    """
+    Runs a whole trace on a fresh simulator and returns (tlb_hits, tlb_misses, page_faults).
+
+    Uses the compiled mem_sim_core extension when it is available and falls back to
+    MemorySimulator.run_trace otherwise.
+    """
+    if _simulate_c is not None:
+        return _simulate_c(addresses, page_size, num_tlb_entries, num_frames, replacement_policy)
+
+    sim = MemorySimulator(page_size, num_tlb_entries, num_frames, replacement_policy)
+    sim.run_trace(addresses)
+    return sim.stats()
+
+
+def simulate_sweep(addresses, configs):
+    """
+    Simulates the same trace under several configurations.
+
+    configs is a numpy structured array of SWEEP_CONFIG_DTYPE, a 2-D integer array or any
+    sequence of rows holding (page_size, num_tlb_entries, num_frames, policy_id), with policy_id taken
+    from _POLICY_IDS. Returns one (tlb_hits, tlb_misses, page_faults) row per config.
+    With numba the configurations run in parallel threads, otherwise one after another
+    through simulate.
+    """
+    if np is not None and not (isinstance(configs, np.ndarray) and configs.dtype == SWEEP_CONFIG_DTYPE):
+        # Built row by row: np.asarray would broadcast every scalar of a plain 2-D array
+        # into all four fields instead of reading one config per row
+        configs = np.array([tuple(int(value) for value in row) for row in configs], dtype=SWEEP_CONFIG_DTYPE)
+
+    # The kernels run without bounds checks, so every row is validated up front
+    policy_ids = set(_POLICY_IDS.values())
+    for page_size, num_tlb_entries, num_frames, policy_id in configs:
+        if int(policy_id) not in policy_ids:
+            raise ValueError("Política de substituição inválida. Use 'LRU' ou 'SecondChance'.")
+        _check_parameters(int(page_size), int(num_tlb_entries), int(num_frames))
+
+    # Every configuration reads the whole trace, so one-shot iterators are materialized once
+    addresses = _as_address_array(addresses) if np is not None else list(addresses)
+
+    if not _HAS_NUMBA:
+        policy_names = {policy_id: name for name, policy_id in _POLICY_IDS.items()}
+        results = [
+            simulate(addresses, int(page_size), int(num_tlb_entries), int(num_frames), policy_names[int(policy_id)])
+            for page_size, num_tlb_entries, num_frames, policy_id in configs
+        ]
+        return np.array(results, dtype=np.int64).reshape(-1, 3) if np is not None else results
+
+    results = np.zeros((configs.size, 3), dtype=np.int64)
+    _simulate_sweep(
+        np.ascontiguousarray(addresses),
+        np.ascontiguousarray(configs['page_size']),
+        np.ascontiguousarray(configs['num_tlb_entries']),
+        np.ascontiguousarray(configs['num_frames']),
+        np.ascontiguousarray(configs['policy_id']),
+        results,
+    )
+    return results
+
+
+# Explicit signatures make numba compile the kernels when mem_sim is imported; with
+# cache=True the machine code is stored in __pycache__, so only the first import pays for it.
+#
+# Benchmark (300k Zipf-distributed addresses, 4 KiB pages, 16 TLB entries), run_trace with
+# the kernels vs the interpreted _run_pages_python:
+#   frames    LRU              SecondChance
+#   64        0.021s / 0.32s   0.023s / 0.32s
+#   16384     0.030s / 0.31s   0.020s / 0.21s
+#   65536     0.064s / 0.25s   0.034s / 0.18s
+# The kernels used to scan every frame on each TLB miss (1.2s and 2.3s for LRU at 16384
+# and 65536 frames); the hashed page table and the recency list keep them flat.
+_SIMULATE_LRU_SIGNATURE = (
+    "void(int64[::1], int64, int64, int64[::1], int64[::1], int64[::1], int64[::1], int64[::1], int64[::1])"
+)
+_SIMULATE_SECOND_CHANCE_SIGNATURE = (
+    "int64(int64[::1], int64, int64, int64[::1], int64[::1], int64[::1], int64[::1], uint64[::1], int64, int64[::1])"
+)
+
+# Fibonacci hashing multiplier (2**64 / golden ratio), same as the page table of mem_sim_core
+_FIB_MULTIPLIER = 11400714819323198485
+
+
+@njit("int64(int64)", cache=True)
+def _pt_shift(num_frames):
+    """Shift of the Fibonacci hash for a page table with at least 2 * num_frames slots."""
+    shift = 63
+    while (1 << (64 - shift)) < 2 * num_frames:
+        shift -= 1
+    return shift
+
+
+@njit("int64(int64, int64)", cache=True)
+def _pt_home(page, shift):
+    """Home slot of page: Fibonacci hashing spreads consecutive page numbers over the table."""
+    return np.int64((np.uint64(page) * np.uint64(_FIB_MULTIPLIER)) >> np.uint64(shift))
+
+
+@njit("int64(int64[::1], int64, int64)", cache=True, boundscheck=False)
+def _pt_slot(pt_keys, page, shift):
+    """Slot holding page, or the empty slot where it would be inserted (linear probing)."""
+    mask = pt_keys.size - 1
+    i = _pt_home(page, shift)
+    while pt_keys[i] != -1 and pt_keys[i] != page:
+        i = (i + 1) & mask
+    return i
+
+
+@njit("void(int64[::1], int64[::1], int64, int64)", cache=True, boundscheck=False)
+def _pt_delete(pt_keys, pt_values, page, shift):
+    """Removes page with backward-shift deletion, so the table never holds tombstones."""
+    mask = pt_keys.size - 1
+    i = _pt_slot(pt_keys, page, shift)
+    j = i
+    while True:
+        j = (j + 1) & mask
+        if pt_keys[j] == -1:
+            break
+        home = _pt_home(pt_keys[j], shift)
+        # Entries whose home lies cyclically in (i, j] are still reachable, keep them
+        if (i < j and i < home <= j) or (i > j and (home > i or home <= j)):
+            continue
+        pt_keys[i] = pt_keys[j]
+        pt_values[i] = pt_values[j]
+        i = j
+    pt_keys[i] = -1
+
+
+@njit("int64(int64[::1], int64[::1], int64[::1], int64)", cache=True, boundscheck=False)
+def _pt_fill(pt_pages, pt_keys, pt_values, shift):
+    """Hashes every loaded frame of pt_pages into pt_keys/pt_values; returns how many there are."""
+    used_frames = 0
+    for f in range(pt_pages.size):
+        if pt_pages[f] != -1:
+            slot = _pt_slot(pt_keys, pt_pages[f], shift)
+            pt_keys[slot] = pt_pages[f]
+            pt_values[slot] = f
+            used_frames += 1
+    return used_frames
+
+
+@njit("void(int64[::1], int64[::1], int64)", cache=True, boundscheck=False)
+def _lru_push_back(lru_prev, lru_next, frame):
+    """Appends frame as the MRU end of the recency list (the sentinel is the last node)."""
+    sentinel = lru_prev.size - 1
+    tail = lru_prev[sentinel]
+    lru_next[tail] = frame
+    lru_prev[frame] = tail
+    lru_next[frame] = sentinel
+    lru_prev[sentinel] = frame
+
+
+@njit("void(int64[::1], int64[::1], int64)", cache=True, boundscheck=False)
+def _lru_move_to_back(lru_prev, lru_next, frame):
+    """Unlinks frame from the recency list and appends it again as the MRU."""
+    lru_next[lru_prev[frame]] = lru_next[frame]
+    lru_prev[lru_next[frame]] = lru_prev[frame]
+    _lru_push_back(lru_prev, lru_next, frame)
+
+
+@njit(_SIMULATE_LRU_SIGNATURE, cache=True, boundscheck=False)
+def _simulate_lru(pages, num_tlb, num_frames, tlb_pages, tlb_frames, tlb_ts, pt_pages, pt_ts, stats):
+    """
+    Compiled LRU simulation loop over an int64 array of page numbers (see run_trace).
+
+    The TLB is kept in tlb_pages/tlb_frames and the frames in pt_pages
+    (pt_pages[frame] = page_number), with -1 marking an empty slot. The *_ts arrays hold
+    the time of the last access. All arrays are updated in place and the counts are added
+    to stats (tlb_hits, tlb_misses, page_faults).
+
+    Internally the page table is an open-addressed hash (as in mem_sim_core) and the
+    frames are linked in a circular recency list, LRU first, so no step scans the frames.
+    """
+    clock = 0
+    for j in range(num_tlb):
+        clock = max(clock, tlb_ts[j])
+    for f in range(num_frames):
+        clock = max(clock, pt_ts[f])
+
+    shift = _pt_shift(num_frames)
+    pt_keys = np.full(1 << (64 - shift), -1, dtype=np.int64)
+    pt_values = np.zeros(pt_keys.size, dtype=np.int64)
+    # Frames are handed out lowest first and never freed, so the loaded ones are a prefix
+    used_frames = _pt_fill(pt_pages, pt_keys, pt_values, shift)
+
+    # Recency list over the frames; node num_frames is the sentinel (next = LRU, prev = MRU)
+    lru_prev = np.empty(num_frames + 1, dtype=np.int64)
+    lru_next = np.empty(num_frames + 1, dtype=np.int64)
+    lru_prev[num_frames] = num_frames
+    lru_next[num_frames] = num_frames
+    for f in np.argsort(pt_ts[:used_frames]):
+        _lru_push_back(lru_prev, lru_next, f)
+
+    hits = 0
+    misses = 0
+    faults = 0
+    last_page = -1  # previous page, already the MRU everywhere: a repeat needs no update
+    for i in range(pages.size):
+        page = pages[i]
+        if page == last_page:
+            hits += 1
+            continue
+        clock += 1
+
+        # Verify TLB:
+        slot = -1
+        for j in range(num_tlb):
+            if tlb_pages[j] == page:
+                slot = j
+                break
+        if slot >= 0:
+            hits += 1
+            tlb_ts[slot] = clock
+            frame = tlb_frames[slot]
+            pt_ts[frame] = clock
+            _lru_move_to_back(lru_prev, lru_next, frame)
+            last_page = page
+            continue
+        misses += 1
+
+        # Verify Page Table:
+        slot = _pt_slot(pt_keys, page, shift)
+        if pt_keys[slot] != -1:
+            frame = pt_values[slot]
+            _lru_move_to_back(lru_prev, lru_next, frame)
+        else:
+            faults += 1
+            if used_frames < num_frames:
+                frame = used_frames
+                used_frames += 1
+                _lru_push_back(lru_prev, lru_next, frame)
+            else:  # no free frame, evict the LRU page
+                frame = lru_next[num_frames]
+                victim = pt_pages[frame]
+                _pt_delete(pt_keys, pt_values, victim, shift)
+                for j in range(num_tlb):
+                    if tlb_pages[j] == victim:
+                        tlb_pages[j] = -1
+                        tlb_ts[j] = 0
+                        break
+                slot = _pt_slot(pt_keys, page, shift)
+                _lru_move_to_back(lru_prev, lru_next, frame)
+            pt_keys[slot] = page
+            pt_values[slot] = frame
+            pt_pages[frame] = page
+        pt_ts[frame] = clock
+
+        # Insert into the TLB, replacing the LRU entry if it is full
+        if num_tlb == 0:
+            continue
+        slot = 0
+        for j in range(num_tlb):
+            if tlb_pages[j] == -1:
+                slot = j
+                break
+            if tlb_ts[j] < tlb_ts[slot]:
+                slot = j
+        tlb_pages[slot] = page
+        tlb_frames[slot] = frame
+        tlb_ts[slot] = clock
+        last_page = page
+
+    stats[0] += hits
+    stats[1] += misses
+    stats[2] += faults
+
+
+@njit("int64(uint64)", cache=True)
+def _lowest_set_bit(word):
+    """Index of the lowest set bit of a non-zero uint64 (binary search over halves)."""
+    index = 0
+    for width in (32, 16, 8, 4, 2, 1):
+        low_mask = (np.uint64(1) << np.uint64(width)) - np.uint64(1)
+        if word & low_mask == 0:
+            word >>= np.uint64(width)
+            index += width
+    return index
+
+
+@njit(_SIMULATE_SECOND_CHANCE_SIGNATURE, cache=True, boundscheck=False)
+def _simulate_second_chance(pages, num_tlb, num_frames, tlb_pages, tlb_frames, tlb_ts, pt_pages, ref_bits, hand, stats):
+    """
+    Compiled Second Chance (clock) simulation loop over an int64 array of page numbers.
+
+    TLB, frame and page table handling follow _simulate_lru. ref_bits is the packed uint64 bitmap
+    of reference bits (bit f & 63 of word f >> 6) and hand the next frame the clock
+    inspects. Arrays are updated in place, the counts are added to stats and the new
+    hand is returned.
+    """
+    one = np.uint64(1)
+    all_set = ~np.uint64(0)
+
+    clock = 0
+    for j in range(num_tlb):
+        clock = max(clock, tlb_ts[j])
+
+    shift = _pt_shift(num_frames)
+    pt_keys = np.full(1 << (64 - shift), -1, dtype=np.int64)
+    pt_values = np.zeros(pt_keys.size, dtype=np.int64)
+    used_frames = _pt_fill(pt_pages, pt_keys, pt_values, shift)
+
+    hits = 0
+    misses = 0
+    faults = 0
+    last_page = -1  # previous page, already the MRU everywhere: a repeat needs no update
+    for i in range(pages.size):
+        page = pages[i]
+        if page == last_page:
+            hits += 1
+            continue
+        clock += 1
+
+        # Verify TLB:
+        frame = -1
+        for j in range(num_tlb):
+            if tlb_pages[j] == page:
+                tlb_ts[j] = clock
+                frame = tlb_frames[j]
+                break
+        if frame >= 0:
+            hits += 1
+            ref_bits[frame >> 6] |= one << np.uint64(frame & 63)
+            last_page = page
+            continue
+        misses += 1
+
+        # Verify Page Table:
+        slot = _pt_slot(pt_keys, page, shift)
+        if pt_keys[slot] != -1:
+            frame = pt_values[slot]
+        else:
+            faults += 1
+            if used_frames < num_frames:
+                frame = used_frames
+                used_frames += 1
+            while frame < 0:  # no free frame, advance the clock 64 frames at a time
+                word_index = hand >> 6
+                bit = hand & 63
+                valid_bits = min(64, num_frames - (word_index << 6)) - bit
+                mask = all_set if valid_bits == 64 else (one << np.uint64(valid_bits)) - one
+                clear_bits = ~(ref_bits[word_index] >> np.uint64(bit)) & mask
+                if clear_bits != 0:
+                    offset = _lowest_set_bit(clear_bits)
+                    ref_bits[word_index] &= ~(((one << np.uint64(offset)) - one) << np.uint64(bit))
+                    frame = hand + offset
+                    hand = (frame + 1) % num_frames
+                else:
+                    ref_bits[word_index] &= (one << np.uint64(bit)) - one
+                    hand = (word_index + 1) << 6
+                    if hand >= num_frames:
+                        hand = 0
+            if pt_pages[frame] != -1:
+                victim = pt_pages[frame]
+                _pt_delete(pt_keys, pt_values, victim, shift)
+                for j in range(num_tlb):
+                    if tlb_pages[j] == victim:
+                        tlb_pages[j] = -1
+                        tlb_ts[j] = 0
+                        break
+                slot = _pt_slot(pt_keys, page, shift)
+            pt_keys[slot] = page
+            pt_values[slot] = frame
+            pt_pages[frame] = page
+        ref_bits[frame >> 6] |= one << np.uint64(frame & 63)
+
+        # Insert into the TLB, replacing the LRU entry if it is full
+        if num_tlb == 0:
+            continue
+        slot = 0
+        for j in range(num_tlb):
+            if tlb_pages[j] == -1:
+                slot = j
+                break
+            if tlb_ts[j] < tlb_ts[slot]:
+                slot = j
+        tlb_pages[slot] = page
+        tlb_frames[slot] = frame
+        tlb_ts[slot] = clock
+        last_page = page
+
+    stats[0] += hits
+    stats[1] += misses
+    stats[2] += faults
+    return hand
+
+
+@njit(parallel=True, cache=True)
+def _simulate_sweep(addresses, page_sizes, num_tlb_entries, num_frames, policy_ids, results):
+    """
+    Runs one independent simulation per configuration, spread over threads with prange.
+    Each one starts from an empty TLB and memory; results[i] receives its counts.
+    """
+    for i in prange(page_sizes.size):
+        pages = addresses // page_sizes[i]
+        tlb_pages = np.full(num_tlb_entries[i], -1, dtype=np.int64)
+        tlb_frames = np.zeros(num_tlb_entries[i], dtype=np.int64)
+        tlb_ts = np.zeros(num_tlb_entries[i], dtype=np.int64)
+        pt_pages = np.full(num_frames[i], -1, dtype=np.int64)
+        stats = results[i]
+
+        if policy_ids[i] == _LRU:
+            pt_ts = np.zeros(num_frames[i], dtype=np.int64)
+            _simulate_lru(pages, num_tlb_entries[i], num_frames[i],
+                          tlb_pages, tlb_frames, tlb_ts, pt_pages, pt_ts, stats)
+        else:
+            ref_bits = np.zeros((num_frames[i] + 63) // 64, dtype=np.uint64)
+            _simulate_second_chance(pages, num_tlb_entries[i], num_frames[i],
+                                    tlb_pages, tlb_frames, tlb_ts, pt_pages, ref_bits, 0, stats)
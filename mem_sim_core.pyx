@@ -0,0 +1,287 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled version of the simulator core (optional).
+
+Build in place with:
+
+    cythonize -i mem_sim_core.pyx
+
+mem_sim.simulate uses this module when it can be imported and falls back to the
+pure-Python MemorySimulator otherwise. The statistics are the same for both.
+"""
+from array import array
+
+from libc.stdlib cimport malloc, calloc, free
+
+cdef enum:
+    POLICY_LRU = 0
+    POLICY_SECOND_CHANCE = 1
+
+
+cdef class MemorySimulatorC:
+    """
+    Same model as mem_sim.MemorySimulator, with every structure in C arrays:
+
+    * TLB: tlb_pages/tlb_frames/tlb_ts, linear scan (few entries), LRU by timestamp.
+    * Page table: open-addressed hash page_number -> frame_number (linear probing,
+      backward-shift deletion, so no tombstones).
+    * Frames: frame_pages[frame] = page_number, plus a circular recency list over the
+      frames with a sentinel node, LRU first (LRU), or the reference bit and clock hand
+      (SecondChance).
+    """
+    cdef readonly long long page_size
+    cdef int page_shift
+    cdef readonly int num_tlb_entries
+    cdef readonly int num_frames
+    cdef readonly long long tlb_hits
+    cdef readonly long long tlb_misses
+    cdef readonly long long page_faults
+    cdef int policy
+
+    cdef long long *tlb_pages
+    cdef long long *tlb_frames
+    cdef long long *tlb_ts
+
+    cdef long long *pt_keys
+    cdef long long *pt_values
+    cdef unsigned long long pt_mask
+    cdef int pt_shift
+
+    cdef long long *frame_pages
+    cdef int *lru_prev
+    cdef int *lru_next
+    cdef char *ref_bits
+    cdef int hand
+    cdef long long last_page
+    cdef long long last_frame
+    cdef int used_frames
+    cdef long long clock
+
+    def __cinit__(self, long long page_size, int num_tlb_entries, int num_frames, replacement_policy):
+        cdef int capacity = 1
+        cdef int bits = 0
+        cdef int i
+
+        if replacement_policy == 'LRU':
+            self.policy = POLICY_LRU
+        elif replacement_policy == 'SecondChance':
+            self.policy = POLICY_SECOND_CHANCE
+        else:
+            raise ValueError("Política de substituição inválida. Use 'LRU' ou 'SecondChance'.")
+
+        if page_size <= 0 or page_size & (page_size - 1) != 0:
+            raise ValueError("Tamanho de página inválido. Use uma potência de 2.")
+        if num_tlb_entries < 0:
+            raise ValueError("Número de entradas na TLB inválido. Use um valor maior ou igual a 0.")
+        if num_frames < 1:
+            raise ValueError("Número de frames inválido. Use pelo menos 1 frame.")
+
+        self.page_size = page_size
+        while (1LL << self.page_shift) < page_size:
+            self.page_shift += 1
+        self.num_tlb_entries = num_tlb_entries
+        self.num_frames = num_frames
+
+        while capacity < 2 * num_frames:
+            capacity <<= 1
+            bits += 1
+        self.pt_mask = capacity - 1
+        self.pt_shift = 64 - bits
+
+        self.tlb_pages = <long long *> malloc(max(num_tlb_entries, 1) * sizeof(long long))
+        self.tlb_frames = <long long *> calloc(max(num_tlb_entries, 1), sizeof(long long))
+        self.tlb_ts = <long long *> calloc(max(num_tlb_entries, 1), sizeof(long long))
+        self.pt_keys = <long long *> malloc(capacity * sizeof(long long))
+        self.pt_values = <long long *> calloc(capacity, sizeof(long long))
+        self.frame_pages = <long long *> malloc(max(num_frames, 1) * sizeof(long long))
+        self.lru_prev = <int *> malloc((num_frames + 1) * sizeof(int))
+        self.lru_next = <int *> malloc((num_frames + 1) * sizeof(int))
+        self.ref_bits = <char *> calloc(max(num_frames, 1), sizeof(char))
+        if (not self.tlb_pages or not self.tlb_frames or not self.tlb_ts or not self.pt_keys
+                or not self.pt_values or not self.frame_pages or not self.lru_prev or not self.lru_next or not self.ref_bits):
+            raise MemoryError()
+
+        self.last_page = -1
+        for i in range(num_tlb_entries):
+            self.tlb_pages[i] = -1
+        for i in range(capacity):
+            self.pt_keys[i] = -1
+        for i in range(num_frames):
+            self.frame_pages[i] = -1
+        self.lru_prev[num_frames] = num_frames
+        self.lru_next[num_frames] = num_frames
+
+    def __dealloc__(self):
+        free(self.tlb_pages)
+        free(self.tlb_frames)
+        free(self.tlb_ts)
+        free(self.pt_keys)
+        free(self.pt_values)
+        free(self.frame_pages)
+        free(self.lru_prev)
+        free(self.lru_next)
+        free(self.ref_bits)
+
+    cdef inline unsigned long long _pt_home(self, long long page_number) noexcept nogil:
+        # Fibonacci hashing: spreads consecutive page numbers over the table
+        if self.pt_shift == 64:
+            return 0
+        return (<unsigned long long> page_number * 11400714819323198485ULL) >> self.pt_shift
+
+    cdef inline unsigned long long _pt_slot(self, long long page_number) noexcept nogil:
+        """Slot holding page_number, or the empty slot where it would be inserted."""
+        cdef unsigned long long i = self._pt_home(page_number)
+        while self.pt_keys[i] != -1 and self.pt_keys[i] != page_number:
+            i = (i + 1) & self.pt_mask
+        return i
+
+    cdef void _pt_delete(self, long long page_number) noexcept nogil:
+        cdef unsigned long long i = self._pt_slot(page_number)
+        cdef unsigned long long j = i
+        cdef unsigned long long home
+        while True:
+            j = (j + 1) & self.pt_mask
+            if self.pt_keys[j] == -1:
+                break
+            home = self._pt_home(self.pt_keys[j])
+            # Entries whose home lies cyclically in (i, j] are still reachable, keep them
+            if (i < j and i < home <= j) or (i > j and (home > i or home <= j)):
+                continue
+            self.pt_keys[i] = self.pt_keys[j]
+            self.pt_values[i] = self.pt_values[j]
+            i = j
+        self.pt_keys[i] = -1
+
+    cdef void _tlb_remove(self, long long page_number) noexcept nogil:
+        cdef int j
+        for j in range(self.num_tlb_entries):
+            if self.tlb_pages[j] == page_number:
+                self.tlb_pages[j] = -1
+                self.tlb_ts[j] = 0
+                return
+
+    cdef void _tlb_insert(self, long long page_number, long long frame_number) noexcept nogil:
+        cdef int j
+        cdef int slot = 0
+        if self.num_tlb_entries == 0:
+            return
+        for j in range(self.num_tlb_entries):
+            if self.tlb_pages[j] == -1:
+                slot = j
+                break
+            if self.tlb_ts[j] < self.tlb_ts[slot]:
+                slot = j
+        self.tlb_pages[slot] = page_number
+        self.tlb_frames[slot] = frame_number
+        self.tlb_ts[slot] = self.clock
+
+    cdef inline void _lru_push_back(self, int frame) noexcept nogil:
+        """Appends frame as the MRU end of the recency list (node num_frames is the sentinel)."""
+        cdef int tail = self.lru_prev[self.num_frames]
+        self.lru_next[tail] = frame
+        self.lru_prev[frame] = tail
+        self.lru_next[frame] = self.num_frames
+        self.lru_prev[self.num_frames] = frame
+
+    cdef inline void _lru_touch(self, int frame) noexcept nogil:
+        """Moves a loaded frame to the MRU end of the recency list."""
+        self.lru_next[self.lru_prev[frame]] = self.lru_next[frame]
+        self.lru_prev[self.lru_next[frame]] = self.lru_prev[frame]
+        self._lru_push_back(frame)
+
+    cdef int _find_victim(self) noexcept nogil:
+        cdef int victim
+        if self.policy == POLICY_LRU:
+            return self.lru_next[self.num_frames]  # head of the recency list
+
+        while self.ref_bits[self.hand]:  # Second Chance: clear the bit and move on
+            self.ref_bits[self.hand] = 0
+            self.hand = (self.hand + 1) % self.num_frames
+        victim = self.hand
+        self.hand = (self.hand + 1) % self.num_frames
+        return victim
+
+    cdef long long _access(self, long long virtual_address) noexcept nogil:
+        cdef long long page_number = virtual_address >> self.page_shift
+        cdef long long frame_number
+        cdef unsigned long long slot
+        cdef int j
+
+        # Same page as the previous access: already the MRU everywhere, nothing to update
+        if page_number == self.last_page:
+            self.tlb_hits += 1
+            return self.last_frame
+
+        self.clock += 1
+
+        # Verify TLB:
+        for j in range(self.num_tlb_entries):
+            if self.tlb_pages[j] == page_number:
+                self.tlb_hits += 1
+                self.tlb_ts[j] = self.clock
+                frame_number = self.tlb_frames[j]
+                if self.policy == POLICY_LRU:
+                    self._lru_touch(<int> frame_number)
+                else:
+                    self.ref_bits[frame_number] = 1
+                self.last_page = page_number
+                self.last_frame = frame_number
+                return frame_number
+        self.tlb_misses += 1
+
+        # Verify Page Table:
+        slot = self._pt_slot(page_number)
+        if self.pt_keys[slot] != -1:
+            frame_number = self.pt_values[slot]
+        else:
+            self.page_faults += 1
+            if self.used_frames < self.num_frames:
+                frame_number = self.used_frames
+                self.used_frames += 1
+                if self.policy == POLICY_LRU:
+                    self._lru_push_back(<int> frame_number)  # linked here, moved to the MRU end below
+            else:
+                frame_number = self._find_victim()
+                self._pt_delete(self.frame_pages[frame_number])
+                self._tlb_remove(self.frame_pages[frame_number])
+                slot = self._pt_slot(page_number)
+            self.pt_keys[slot] = page_number
+            self.pt_values[slot] = frame_number
+            self.frame_pages[frame_number] = page_number
+
+        if self.policy == POLICY_LRU:
+            self._lru_touch(<int> frame_number)
+        else:
+            self.ref_bits[frame_number] = 1
+        self._tlb_insert(page_number, frame_number)
+        if self.num_tlb_entries > 0:
+            self.last_page = page_number
+            self.last_frame = frame_number
+        return frame_number
+
+    def access_memory(self, long long virtual_address):
+        """Simulates one access. Returns the frame number where the page is mapped."""
+        return self._access(virtual_address)
+
+    def stats(self):
+        """Returns (tlb_hits, tlb_misses, page_faults)."""
+        return self.tlb_hits, self.tlb_misses, self.page_faults
+
+    def run_trace(self, addresses):
+        """Simulates a whole sequence of virtual addresses (any int64 buffer or iterable of ints)."""
+        cdef const long long[::1] buf
+        cdef Py_ssize_t i
+        try:
+            buf = addresses
+        except (TypeError, ValueError):
+            buf = array('q', addresses)
+        with nogil:
+            for i in range(buf.shape[0]):
+                self._access(buf[i])
+
+
+def simulate(addresses, long long page_size, int num_tlb_entries, int num_frames, replacement_policy):
+    """Runs a whole trace on a fresh simulator and returns (tlb_hits, tlb_misses, page_faults)."""
+    cdef MemorySimulatorC sim = MemorySimulatorC(page_size, num_tlb_entries, num_frames, replacement_policy)
+    sim.run_trace(addresses)
+    return sim.stats()
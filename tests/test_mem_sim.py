@@ -0,0 +1,164 @@
+"""
+Runs every tests/*.trace through each simulator entry point. The default configuration
+is compared with the matching *.expected file, the others with access_memory.
+"""
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR.parent))
+
+from mem_sim import MemorySimulator, _POLICY_IDS, simulate, simulate_sweep  # noqa: E402
+
+PAGE_SIZE = 4096
+NUM_TLB_ENTRIES = 16
+NUM_FRAMES = 64
+
+POLICIES = ("LRU", "SecondChance")
+TRACES = sorted(TESTS_DIR.glob("*.trace"))
+
+# (page_size, num_tlb_entries, num_frames): one frame, no TLB, and frame counts that
+# leave a partial word (65) or span several words (130) of the SecondChance bitmap
+CONFIGS = [
+    (PAGE_SIZE, NUM_TLB_ENTRIES, NUM_FRAMES),
+    (PAGE_SIZE, 0, 1),
+    (PAGE_SIZE, 1, 3),
+    (256, 0, 65),
+    (64, 4, 130),
+]
+
+CASES = [(trace, policy) for trace in TRACES for policy in POLICIES]
+
+
+def read_trace(trace):
+    with open(trace, "r") as f:
+        return [int(line) for line in f]
+
+
+def read_expected(trace, policy):
+    text = (TESTS_DIR / f"{trace.stem}_{policy.lower()}.expected").read_text(encoding="utf-8")
+    return tuple(
+        int(re.search(label + r":\s+([\d,]+)", text).group(1).replace(",", ""))
+        for label in ("TLB Hits", "TLB Misses", "Page Faults")
+    )
+
+
+def run_access_memory(addresses, policy, config=CONFIGS[0]):
+    sim = MemorySimulator(*config, policy)
+    for virtual_address in addresses:
+        sim.access_memory(virtual_address)
+    return sim.stats()
+
+
+def run_trace(addresses, policy, config=CONFIGS[0]):
+    sim = MemorySimulator(*config, policy)
+    sim.run_trace(addresses)
+    return sim.stats()
+
+
+def run_trace_generator(addresses, policy, config=CONFIGS[0]):
+    sim = MemorySimulator(*config, policy)
+    sim.run_trace(virtual_address for virtual_address in addresses)
+    return sim.stats()
+
+
+def run_mixed(addresses, policy, config=CONFIGS[0]):
+    # access_memory -> run_trace -> access_memory: the state has to survive the hand-offs
+    first, second = len(addresses) // 3, 2 * len(addresses) // 3
+    sim = MemorySimulator(*config, policy)
+    for virtual_address in addresses[:first]:
+        sim.access_memory(virtual_address)
+    sim.run_trace(addresses[first:second])
+    for virtual_address in addresses[second:]:
+        sim.access_memory(virtual_address)
+    return sim.stats()
+
+
+def run_simulate(addresses, policy, config=CONFIGS[0]):
+    return tuple(simulate(addresses, *config, policy))
+
+
+def run_simulate_generator(addresses, policy, config=CONFIGS[0]):
+    return tuple(simulate((virtual_address for virtual_address in addresses), *config, policy))
+
+
+def run_sweep(addresses, policy, config=CONFIGS[0]):
+    results = simulate_sweep(addresses, [(*config, _POLICY_IDS[policy])])
+    return tuple(int(count) for count in results[0])
+
+
+ENTRY_POINTS = [run_access_memory, run_trace, run_trace_generator, run_mixed, run_simulate,
+                run_simulate_generator, run_sweep]
+
+
+def as_counts(results):
+    return [tuple(int(count) for count in row) for row in results]
+
+
+@pytest.mark.parametrize("entry_point", ENTRY_POINTS, ids=lambda f: f.__name__)
+@pytest.mark.parametrize("trace, policy", CASES, ids=lambda case: getattr(case, "stem", case))
+def test_matches_expected(trace, policy, entry_point):
+    assert entry_point(read_trace(trace), policy) == read_expected(trace, policy)
+
+
+@pytest.mark.parametrize("entry_point", ENTRY_POINTS[1:], ids=lambda f: f.__name__)
+@pytest.mark.parametrize("config", CONFIGS[1:], ids=str)
+@pytest.mark.parametrize("trace, policy", CASES, ids=lambda case: getattr(case, "stem", case))
+def test_matches_access_memory(trace, policy, config, entry_point):
+    addresses = read_trace(trace)
+    assert entry_point(addresses, policy, config) == run_access_memory(addresses, policy, config)
+
+
+@pytest.mark.parametrize("trace, policy", CASES, ids=lambda case: getattr(case, "stem", case))
+def test_run_file(trace, policy):
+    sim = MemorySimulator(PAGE_SIZE, NUM_TLB_ENTRIES, NUM_FRAMES, policy)
+    sim.run_file(str(trace))
+    assert sim.stats() == read_expected(trace, policy)
+
+
+@pytest.mark.parametrize("trace", TRACES, ids=lambda trace: trace.stem)
+def test_sweep_runs_every_config(trace):
+    addresses = read_trace(trace)
+    configs = [(*config, _POLICY_IDS[policy]) for config in CONFIGS for policy in POLICIES]
+    expected = [run_access_memory(addresses, policy, config) for config in CONFIGS for policy in POLICIES]
+
+    # A generator is consumed once, although every configuration reads the whole trace
+    assert as_counts(simulate_sweep(iter(addresses), configs)) == expected
+
+    np = pytest.importorskip("numpy")
+    from mem_sim import SWEEP_CONFIG_DTYPE
+
+    for config_array in (np.array(configs, dtype=SWEEP_CONFIG_DTYPE), np.array(configs)):
+        results = simulate_sweep(np.array(addresses), config_array)
+        assert results.shape == (len(configs), 3)
+        assert as_counts(results) == expected
+
+
+INVALID_PARAMETERS = [
+    (0, NUM_TLB_ENTRIES, NUM_FRAMES, "Tamanho de página"),
+    (3000, NUM_TLB_ENTRIES, NUM_FRAMES, "Tamanho de página"),
+    (PAGE_SIZE, -1, NUM_FRAMES, "entradas na TLB"),
+    (PAGE_SIZE, NUM_TLB_ENTRIES, 0, "Número de frames"),
+]
+
+
+@pytest.mark.parametrize("page_size, num_tlb_entries, num_frames, message", INVALID_PARAMETERS)
+def test_invalid_parameters(page_size, num_tlb_entries, num_frames, message):
+    with pytest.raises(ValueError, match=message):
+        MemorySimulator(page_size, num_tlb_entries, num_frames, "LRU")
+    with pytest.raises(ValueError, match=message):
+        simulate([0], page_size, num_tlb_entries, num_frames, "LRU")
+    with pytest.raises(ValueError, match=message):
+        simulate_sweep([0], [(page_size, num_tlb_entries, num_frames, _POLICY_IDS["LRU"])])
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError, match="Política de substituição"):
+        MemorySimulator(PAGE_SIZE, NUM_TLB_ENTRIES, NUM_FRAMES, "FIFO")
+    with pytest.raises(ValueError, match="Política de substituição"):
+        simulate([0], PAGE_SIZE, NUM_TLB_ENTRIES, NUM_FRAMES, "FIFO")
+    with pytest.raises(ValueError, match="Política de substituição"):
+        simulate_sweep([0], [(PAGE_SIZE, NUM_TLB_ENTRIES, NUM_FRAMES, 7)])